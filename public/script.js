@@ -33,6 +33,8 @@
   let currentTurn = 0;
   let myIndex = null;
   let board = [];
+  // The server sends JSON as binary frames; decode them back to text.
+  const decoder = new TextDecoder();
   // Default starting board size. Once a game starts, the board size is determined
   // by the length of the `board` array sent from the server. The board can grow
   // dynamically when a player scores, so we no longer rely on a fixed constant.
@@ -63,6 +65,22 @@
     messagesElem.textContent = '';
   }
 
+  /**
+   * Unpack a board sent by the server as base64 of its row-major cells
+   * (one byte per cell) into a 2D array
+   * @param {string} encoded
+   * @param {number} size
+   * @returns {number[][]}
+   */
+  function decodeBoard(encoded, size) {
+    const bytes = Uint8Array.from(atob(encoded), (ch) => ch.charCodeAt(0));
+    const rows = [];
+    for (let r = 0; r < size; r++) {
+      rows.push(Array.from(bytes.subarray(r * size, (r + 1) * size)));
+    }
+    return rows;
+  }
+
   /**
    * Build the empty game board in the DOM
    */
@@ -95,6 +113,22 @@
     }
   }
 
+  /**
+   * Draw the stone (if any) for a single board value into a cell element
+   * @param {HTMLElement} cell
+   * @param {number} val
+   */
+  function renderCell(cell, val) {
+    // Clear previous content
+    cell.innerHTML = '';
+    if (val === 1 || val === 2) {
+      const stone = document.createElement('div');
+      stone.classList.add('stone');
+      stone.classList.add(val === 1 ? 'black' : 'white');
+      cell.appendChild(stone);
+    }
+  }
+
   /**
    * Render the board state by placing stones in their respective cells
    */
@@ -112,15 +146,7 @@
       for (let c = 0; c < size; c++) {
         const cell = cells[c];
         if (!cell) continue;
-        // Clear previous content
-        cell.innerHTML = '';
-        const val = board[r][c];
-        if (val === 1 || val === 2) {
-          const stone = document.createElement('div');
-          stone.classList.add('stone');
-          stone.classList.add(val === 1 ? 'black' : 'white');
-          cell.appendChild(stone);
-        }
+        renderCell(cell, board[r][c]);
       }
     }
   }
@@ -213,11 +239,13 @@
     const protocol = location.protocol === 'https:' ? 'wss' : 'ws';
     const wsUrl = `${protocol}://${location.host}/ws`;
     socket = new WebSocket(wsUrl);
+    socket.binaryType = 'arraybuffer';
     socket.addEventListener('open', () => {
       console.log('Connected to server');
     });
     socket.addEventListener('message', (event) => {
-      const data = JSON.parse(event.data);
+      const text = typeof event.data === 'string' ? event.data : decoder.decode(event.data);
+      const data = JSON.parse(text);
       handleServerMessage(data);
     });
     socket.addEventListener('close', () => {
@@ -250,7 +278,7 @@
         break;
       case 'gameStarted':
         currentRoom = data.room;
-        board = JSON.parse(JSON.stringify(data.board));
+        board = decodeBoard(data.board, data.boardSize);
         players = data.players;
         names = data.names;
         scores = data.scores;
@@ -273,19 +301,27 @@
         clearMessage();
         break;
       case 'moveMade':
-        // Update board and turn after a move
-        board = JSON.parse(JSON.stringify(data.board));
+        // Apply the single new stone and update the turn
+        board[data.row][data.col] = data.playerIndex + 1;
         currentTurn = data.currentTurn;
-        // If the board size has changed (e.g., after a player scores and the board is enlarged),
-        // rebuild the board DOM so each cell has the correct coordinates and listeners.
-        const newSize = board.length;
-        if (boardContainer.children.length !== newSize) {
-          buildBoard(newSize);
-        }
-        renderBoard();
+        renderCell(boardContainer.children[data.row].children[data.col], board[data.row][data.col]);
         updateTurnIndicator();
         clearMessage();
         break;
+      case 'boardResized':
+        // After a player scores the board is enlarged. Pad the local board with
+        // empty cells and rebuild the board DOM so each cell has the correct
+        // coordinates and listeners.
+        const newSize = data.newSize;
+        board.forEach((row) => {
+          while (row.length < newSize) row.push(0);
+        });
+        while (board.length < newSize) {
+          board.push(new Array(newSize).fill(0));
+        }
+        buildBoard(newSize);
+        renderBoard();
+        break;
       case 'scoreUpdate':
         scores = data.scores;
         updateScoreBoard();
@@ -294,7 +330,7 @@
         showMessage(`${winName} scored a point!`);
         break;
       case 'gameReset':
-        board = JSON.parse(JSON.stringify(data.board));
+        board = decodeBoard(data.board, data.boardSize);
         scores = data.scores;
         // When the game resets, the server also sends the new currentTurn.
         // Update our local turn state accordingly.
@@ -16,120 +16,185 @@ as required.  See the client code for specifics.
 """
 
 import asyncio
-import json
-import random
-import string
+import base64
+import secrets
+import numpy as np
+import orjson
 from aiohttp import web
-from typing import Dict, List, Optional, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 
 # Constants
 BOARD_SIZE = 15
+# Seconds to wait for a single player's socket during a broadcast
+SEND_TIMEOUT = 5
+
+# Error messages are fixed, so they are encoded once up front
+ERR_INVALID_JSON = orjson.dumps({'type': 'error', 'message': 'Invalid JSON'})
+ERR_ALREADY_IN_GAME = orjson.dumps({'type': 'error', 'message': 'You are already in a game'})
+ERR_GAME_CODE_NOT_FOUND = orjson.dumps({'type': 'error', 'message': 'Game code not found'})
+ERR_GAME_FULL = orjson.dumps({'type': 'error', 'message': 'Game is full'})
+ERR_GAME_NOT_FOUND = orjson.dumps({'type': 'error', 'message': 'Game not found'})
+ERR_WAITING_FOR_OPPONENT = orjson.dumps({'type': 'error', 'message': 'Waiting for opponent'})
+ERR_NOT_IN_GAME = orjson.dumps({'type': 'error', 'message': 'You are not part of this game'})
+ERR_NOT_YOUR_TURN = orjson.dumps({'type': 'error', 'message': 'Not your turn'})
+ERR_INVALID_ROW_OR_COLUMN = orjson.dumps({'type': 'error', 'message': 'Invalid row or column'})
+ERR_INVALID_POSITION = orjson.dumps({'type': 'error', 'message': 'Invalid position'})
+ERR_CELL_OCCUPIED = orjson.dumps({'type': 'error', 'message': 'Cell already occupied'})
 
 
 def generate_room_code() -> str:
     """Generate a unique six‑character room code consisting of
-    uppercase letters and digits.  The room codes are checked
+    uppercase hexadecimal digits.  The room codes are checked
     against existing games to ensure uniqueness."""
     while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        code = secrets.token_hex(3).upper()
         if code not in games:
             return code
 
 
-def create_empty_board(size: int) -> List[List[int]]:
-    """Create an empty NxN board initialized with zeros."""
-    return [[0 for _ in range(size)] for _ in range(size)]
-
-
-def check_victory(board: List[List[int]], row: int, col: int, player: int) -> Optional[List[Tuple[int, int]]]:
-    """Check if placing a stone at (row, col) forms a contiguous line of
-    five or more for the given player.  Returns the positions of the
-    winning stones if a win occurs, otherwise None."""
-    size = len(board)
-    directions = [
-        (1, 0),   # vertical
-        (0, 1),   # horizontal
-        (1, 1),   # diagonal down‑right
-        (1, -1),  # diagonal down‑left
+def create_empty_board(size: int) -> np.ndarray:
+    """Create an empty NxN board initialized with zeros.  The board is a
+    contiguous `uint8` array: 0 is empty, 1 and 2 are the players' stones."""
+    return np.zeros((size, size), dtype=np.uint8)
+
+
+def encode_board(board: np.ndarray) -> str:
+    """Pack the board for the client as base64 of its row‑major cells,
+    one byte per cell."""
+    return base64.b64encode(board.tobytes()).decode()
+
+
+def board_to_bits(board: np.ndarray) -> List[int]:
+    """Build one bitboard per player from a board array.  Cell (row, col)
+    maps to bit `row * (size + 1) + col`; the extra always‑zero bit at the
+    end of each row stops shifted lines from wrapping into the next row."""
+    size = board.shape[0]
+    padded = np.zeros((size, size + 1), dtype=bool)
+    bits = []
+    for player in (1, 2):
+        padded[:, :size] = board == player
+        packed = np.packbits(padded.ravel(), bitorder='little')
+        bits.append(int.from_bytes(packed.tobytes(), 'little'))
+    return bits
+
+
+def check_victory(bits: int, row: int, col: int, stride: int) -> Optional[List[Tuple[int, int]]]:
+    """Check if the stone at (row, col) is part of a contiguous line of
+    five or more in the player's bitboard `bits` (row length `stride`, see
+    `board_to_bits`).  Returns the positions of the winning stones if a
+    win occurs, otherwise None."""
+    pos = row * stride + col
+    shifts = [
+        stride,      # vertical
+        1,           # horizontal
+        stride + 1,  # diagonal down‑right
+        stride - 1,  # diagonal down‑left
     ]
-    for dx, dy in directions:
-        count = 1
+    for s in shifts:
+        # Bit p of `five` is set when five stones start at p; `covered` marks
+        # every stone belonging to such a window.
+        five = bits & (bits >> s) & (bits >> 2 * s) & (bits >> 3 * s) & (bits >> 4 * s)
+        covered = five | (five << s) | (five << 2 * s) | (five << 3 * s) | (five << 4 * s)
+        if not (covered >> pos) & 1:
+            continue
         positions = [(row, col)]
-        # Forward direction
-        x, y = row + dx, col + dy
-        while 0 <= x < size and 0 <= y < size and board[x][y] == player:
-            positions.append((x, y))
-            count += 1
-            x += dx
-            y += dy
-        # Backward direction
-        x, y = row - dx, col - dy
-        while 0 <= x < size and 0 <= y < size and board[x][y] == player:
-            positions.append((x, y))
-            count += 1
-            x -= dx
-            y -= dy
-        if count >= 5:
-            return positions
+        # Forward direction, then backward direction
+        for step in (s, -s):
+            p = pos + step
+            while p >= 0 and (bits >> p) & 1:
+                positions.append(divmod(p, stride))
+                p += step
+        return positions
     return None
 
 
-# Data structures to track connections and games
-connections: Dict[web.WebSocketResponse, Dict[str, Optional[str]]] = {}
+class PlayerState:
+    """Per‑connection player state, stored on the WebSocketResponse as
+    `ws['player']`.  `room` and `index` (the player's seat) are None
+    until the player creates or joins a game."""
+    __slots__ = ('id', 'room', 'index')
+
+    def __init__(self, player_id: str) -> None:
+        self.id = player_id
+        self.room: Optional[str] = None
+        self.index: Optional[int] = None
 
+
+# Game state by room code
 games: Dict[str, Dict] = {}
 
+# Strong references to fire‑and‑forget tasks so they are not collected early
+background_tasks: Set[asyncio.Task] = set()
 
-async def send_json(ws: web.WebSocketResponse, message: Dict) -> None:
-    """Send a JSON message over a WebSocket connection.  If the socket
-    is closed, ignore errors."""
-    if ws.closed:
-        return
+
+async def send_payload(ws: web.WebSocketResponse, payload: bytes) -> None:
+    """Send an already‑encoded JSON payload over a WebSocket connection.
+    Errors from closed or closing sockets are ignored."""
     try:
-        await ws.send_json(message)
+        await ws.send_bytes(payload)
     except Exception:
-        # Ignore send errors for closed/errored sockets
+        # A closed socket raises on write, so no separate `closed` check is needed
         pass
 
 
+async def send_json(ws: web.WebSocketResponse, message: Dict) -> None:
+    """Send a JSON message over a WebSocket connection.  The message is
+    encoded with `orjson` and sent as a binary frame."""
+    await send_payload(ws, orjson.dumps(message))
+
+
+async def safe_send(ws: web.WebSocketResponse, payload: bytes) -> bool:
+    """Send an encoded payload, giving up after `SEND_TIMEOUT` seconds.
+    Returns False if the send failed or timed out."""
+    try:
+        await asyncio.wait_for(ws.send_bytes(payload), SEND_TIMEOUT)
+    except Exception:
+        return False
+    return True
+
+
 async def broadcast(game: Dict, message: Dict) -> None:
-    """Broadcast a message to all players in a game."""
-    tasks = []
-    for player in game['players']:
-        tasks.append(send_json(player['ws'], message))
-    if tasks:
-        await asyncio.gather(*tasks)
+    """Broadcast a message to all players in a game.  The message is
+    serialized once and the same bytes are sent to every player.  Players
+    whose send fails or stalls are disconnected so they cannot hold up
+    the game."""
+    payload = orjson.dumps(message)
+    sockets = list(game['players'])
+    results = await asyncio.gather(*(safe_send(ws, payload) for ws in sockets), return_exceptions=True)
+    for ws, ok in zip(sockets, results):
+        if ok is not True:
+            # Closing ends the socket's handler loop, which runs handle_disconnect
+            task = asyncio.create_task(ws.close())
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
 
 
 async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
     """Handle incoming WebSocket connections and route messages based on
     their `type` field."""
-    ws = web.WebSocketResponse()
+    # Negotiate permessage‑deflate; full board payloads are mostly zeros
+    # and compress well.
+    ws = web.WebSocketResponse(compress=True)
     await ws.prepare(request)
     # Assign a unique player ID
-    player_id = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-    connections[ws] = {'id': player_id, 'room': None}
+    player_id = secrets.token_hex(4)
+    ws['player'] = PlayerState(player_id)
     # Send the id to the client
     await send_json(ws, {'type': 'id', 'id': player_id})
     try:
         async for msg in ws:
             if msg.type == web.WSMsgType.TEXT:
                 try:
-                    data = json.loads(msg.data)
-                except json.JSONDecodeError:
-                    await send_json(ws, {'type': 'error', 'message': 'Invalid JSON'})
+                    data = orjson.loads(msg.data)
+                except orjson.JSONDecodeError:
+                    await send_payload(ws, ERR_INVALID_JSON)
                     continue
                 msg_type = data.get('type')
-                # Handle each message type
-                if msg_type == 'createGame':
-                    await handle_create_game(ws, data)
-                elif msg_type == 'joinGame':
-                    await handle_join_game(ws, data)
-                elif msg_type == 'placeStone':
-                    await handle_place_stone(ws, data)
-                elif msg_type == 'resetGame':
-                    await handle_reset_game(ws, data)
+                # Dispatch to the handler for this message type
+                handler = HANDLERS.get(msg_type)
+                if handler:
+                    await handler(ws, data)
                 else:
                     await send_json(ws, {'type': 'error', 'message': f'Unknown message type: {msg_type}'})
             elif msg.type == web.WSMsgType.ERROR:
@@ -142,91 +207,97 @@ async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
 
 async def handle_create_game(ws: web.WebSocketResponse, data: Dict) -> None:
     """Create a new game room and put the requesting player into it."""
-    player_info = connections[ws]
+    player = ws['player']
     # Prevent creating multiple games if already in one
-    if player_info['room']:
-        await send_json(ws, {'type': 'error', 'message': 'You are already in a game'})
+    if player.room:
+        await send_payload(ws, ERR_ALREADY_IN_GAME)
         return
     room = generate_room_code()
     board = create_empty_board(BOARD_SIZE)
     game = {
         'board': board,
-        'players': [],
+        'bits': [0, 0],
+        'stone_counts': [0, 0],
+        'players': {},
+        'seats': [],
+        'player_ids': [],
         'names': {},
         'scores': {},
         'current_turn': 0,
         'winner_positions': [],
     }
-    # Create player object and add to game
-    player_obj = {'id': player_info['id'], 'ws': ws}
-    game['players'].append(player_obj)
+    # Add the player to the game in seat 0
+    game['players'][ws] = player
+    game['seats'].append(ws)
+    game['player_ids'].append(player.id)
+    player.index = 0
     name = data.get('name') or 'Player 1'
-    game['names'][player_info['id']] = name
-    game['scores'][player_info['id']] = 0
+    game['names'][player.id] = name
+    game['scores'][player.id] = 0
     games[room] = game
-    player_info['room'] = room
+    player.room = room
     # Inform the client of the room code
     await send_json(ws, {'type': 'gameCreated', 'room': room})
-    print(f'Game {room} created by player {player_info["id"]}')
+    print(f'Game {room} created by player {player.id}')
 
 
 async def handle_join_game(ws: web.WebSocketResponse, data: Dict) -> None:
     """Join an existing game room as the second player."""
-    player_info = connections[ws]
-    if player_info['room']:
-        await send_json(ws, {'type': 'error', 'message': 'You are already in a game'})
+    player = ws['player']
+    if player.room:
+        await send_payload(ws, ERR_ALREADY_IN_GAME)
         return
     room = (data.get('room') or '').upper()
     if not room or room not in games:
-        await send_json(ws, {'type': 'error', 'message': 'Game code not found'})
+        await send_payload(ws, ERR_GAME_CODE_NOT_FOUND)
         return
     game = games[room]
     if len(game['players']) >= 2:
-        await send_json(ws, {'type': 'error', 'message': 'Game is full'})
+        await send_payload(ws, ERR_GAME_FULL)
         return
     # Add the new player
-    player_obj = {'id': player_info['id'], 'ws': ws}
-    game['players'].append(player_obj)
+    game['players'][ws] = player
+    player.index = len(game['seats'])
+    game['seats'].append(ws)
+    game['player_ids'].append(player.id)
     name = data.get('name') or 'Player 2'
-    game['names'][player_info['id']] = name
-    game['scores'][player_info['id']] = 0
-    player_info['room'] = room
+    game['names'][player.id] = name
+    game['scores'][player.id] = 0
+    player.room = room
     # Send gameStarted to all players
     message = {
         'type': 'gameStarted',
         'room': room,
-        'board': game['board'],
-        'players': [p['id'] for p in game['players']],
+        'board': encode_board(game['board']),
+        'boardSize': len(game['board']),
+        'players': game['player_ids'],
         'names': game['names'],
         'scores': game['scores'],
         'currentTurn': game['current_turn'],
     }
     await broadcast(game, message)
-    print(f'Player {player_info["id"]} joined game {room}')
+    print(f'Player {player.id} joined game {room}')
 
 
 async def handle_place_stone(ws: web.WebSocketResponse, data: Dict) -> None:
     """Handle a player's move, update game state, and broadcast updates."""
-    player_info = connections.get(ws)
-    if not player_info:
-        return
-    room = player_info.get('room')
+    player = ws['player']
+    room = player.room
     if not room or room not in games:
-        await send_json(ws, {'type': 'error', 'message': 'Game not found'})
+        await send_payload(ws, ERR_GAME_NOT_FOUND)
         return
     game = games[room]
     # Ensure two players are present
     if len(game['players']) < 2:
-        await send_json(ws, {'type': 'error', 'message': 'Waiting for opponent'})
+        await send_payload(ws, ERR_WAITING_FOR_OPPONENT)
         return
     # Determine this player's index
-    player_ids = [p['id'] for p in game['players']]
-    if player_info['id'] not in player_ids:
-        await send_json(ws, {'type': 'error', 'message': 'You are not part of this game'})
+    if ws not in game['players']:
+        await send_payload(ws, ERR_NOT_IN_GAME)
         return
-    player_index = player_ids.index(player_info['id'])
+    player_index = player.index
     if player_index != game['current_turn']:
-        await send_json(ws, {'type': 'error', 'message': 'Not your turn'})
+        await send_payload(ws, ERR_NOT_YOUR_TURN)
         return
     # Validate row and column
     row = data.get('row')
@@ -235,24 +306,29 @@ async def handle_place_stone(ws: web.WebSocketResponse, data: Dict) -> None:
         row = int(row)
         col = int(col)
     except (TypeError, ValueError):
-        await send_json(ws, {'type': 'error', 'message': 'Invalid row or column'})
+        await send_payload(ws, ERR_INVALID_ROW_OR_COLUMN)
         return
     # Validate that the move is within the current dynamic board bounds
     board_size = len(game['board'])
     if not (0 <= row < board_size and 0 <= col < board_size):
-        await send_json(ws, {'type': 'error', 'message': 'Invalid position'})
+        await send_payload(ws, ERR_INVALID_POSITION)
         return
-    if game['board'][row][col] != 0:
-        await send_json(ws, {'type': 'error', 'message': 'Cell already occupied'})
+    if game['board'][row, col] != 0:
+        await send_payload(ws, ERR_CELL_OCCUPIED)
         return
     # Place the stone
     player_value = player_index + 1
-    game['board'][row][col] = player_value
-    # Check for victory
-    win_positions = check_victory(game['board'], row, col, player_value)
+    game['board'][row, col] = player_value
+    stride = board_size + 1
+    game['bits'][player_index] |= 1 << (row * stride + col)
+    game['stone_counts'][player_index] += 1
+    # Check for victory; a line of five needs at least five stones
+    win_positions = None
+    if game['stone_counts'][player_index] >= 5:
+        win_positions = check_victory(game['bits'][player_index], row, col, stride)
     if win_positions:
         # Update score
-        winner_id = player_info['id']
+        winner_id = player.id
         game['scores'][winner_id] = game['scores'].get(winner_id, 0) + 1
         game['winner_positions'] = win_positions
         # Notify players of score update and winning line
@@ -264,89 +340,103 @@ async def handle_place_stone(ws: web.WebSocketResponse, data: Dict) -> None:
         })
         # Instead of resetting the board, enlarge it by adding an extra row and column.
         # The existing stones remain in place and the scoring player keeps the turn.
-        old_board = game['board']
-        old_size = len(old_board)
-        new_size = old_size + 1
-        new_board = create_empty_board(new_size)
-        # Copy the old board into the new board (top‑left corner)
-        for i in range(old_size):
-            for j in range(old_size):
-                new_board[i][j] = old_board[i][j]
+        # The old board is kept in the top‑left corner of the new one.
+        new_board = np.pad(game['board'], ((0, 1), (0, 1)), constant_values=0)
+        new_size = len(new_board)
         game['board'] = new_board
+        # Rebuild the bitboards for the wider row stride
+        game['bits'] = board_to_bits(new_board)
+        # Clients already hold every stone, so only the new size is sent
+        await broadcast(game, {
+            'type': 'boardResized',
+            'room': room,
+            'newSize': new_size,
+        })
         # The scoring player takes the next turn
         game['current_turn'] = player_index
     else:
         # Switch turn to the other player
         game['current_turn'] = 1 - game['current_turn']
-    # Broadcast the move and updated board/turn
+    # Broadcast the move and updated turn; clients apply the single stone
     await broadcast(game, {
         'type': 'moveMade',
         'room': room,
         'row': row,
         'col': col,
         'playerIndex': player_index,
-        'board': game['board'],
         'currentTurn': game['current_turn'],
     })
 
 
 async def handle_reset_game(ws: web.WebSocketResponse, data: Dict) -> None:
     """Reset the board and scores for a game."""
-    player_info = connections.get(ws)
-    if not player_info:
-        return
-    room = player_info.get('room')
+    room = ws['player'].room
     if not room or room not in games:
-        await send_json(ws, {'type': 'error', 'message': 'Game not found'})
+        await send_payload(ws, ERR_GAME_NOT_FOUND)
         return
     game = games[room]
     # Reset board to initial size and scores
     game['board'] = create_empty_board(BOARD_SIZE)
+    game['bits'] = [0, 0]
+    game['stone_counts'] = [0, 0]
     game['scores'] = {}
-    for player in game['players']:
-        game['scores'][player['id']] = 0
+    for player in game['players'].values():
+        game['scores'][player.id] = 0
     # Reset turn to the first player (index 0)
     game['current_turn'] = 0
     # Notify players, including the new currentTurn so clients update accordingly
     await broadcast(game, {
         'type': 'gameReset',
-        'board': game['board'],
+        'board': encode_board(game['board']),
+        'boardSize': len(game['board']),
         'scores': game['scores'],
         'currentTurn': game['current_turn'],
     })
 
 
+# Handlers for client message types, keyed by the message's `type` field
+HANDLERS: Dict[str, Callable[[web.WebSocketResponse, Dict], Awaitable[None]]] = {
+    'createGame': handle_create_game,
+    'joinGame': handle_join_game,
+    'placeStone': handle_place_stone,
+    'resetGame': handle_reset_game,
+}
+
+
 async def handle_disconnect(ws: web.WebSocketResponse) -> None:
     """Handle cleanup when a WebSocket client disconnects."""
-    player_info = connections.pop(ws, None)
-    if not player_info:
-        return
-    room = player_info.get('room')
+    player = ws['player']
+    room = player.room
     if not room or room not in games:
         return
+    player.room = None
+    player_id = player.id
     game = games[room]
     # Remove player from game
-    remaining_players = []
-    for p in game['players']:
-        if p['ws'] is not ws:
-            remaining_players.append(p)
-    game['players'] = remaining_players
+    game['players'].pop(ws, None)
+    del game['seats'][player.index]
+    del game['player_ids'][player.index]
+    # Remaining players move up to fill the vacated seat
+    for index, seat in enumerate(game['seats']):
+        game['players'][seat].index = index
     # Remove from names and scores
-    if player_info['id'] in game['names']:
-        del game['names'][player_info['id']]
-    if player_info['id'] in game['scores']:
-        del game['scores'][player_info['id']]
+    if player_id in game['names']:
+        del game['names'][player_id]
+    if player_id in game['scores']:
+        del game['scores'][player_id]
     # If no players remain, delete the game
     if not game['players']:
         del games[room]
         return
     # If one player remains, reset the board so a new opponent can join
     game['board'] = create_empty_board(BOARD_SIZE)
+    game['bits'] = [0, 0]
+    game['stone_counts'] = [0, 0]
     game['current_turn'] = 0
     # Notify the remaining player
     await broadcast(game, {
         'type': 'playerLeft',
-        'playerId': player_info['id'],
+        'playerId': player_id,
     })
 
 
@@ -383,6 +473,13 @@ def create_app() -> web.Application:
 
 
 def main() -> None:
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is unavailable on Windows; fall back to the default event loop
+        pass
+    else:
+        uvloop.install()
     app = create_app()
     port = int(__import__('os').environ.get('PORT', 3000))
     web.run_app(app, port=port)